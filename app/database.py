@@ -9,10 +9,20 @@ class Database:
     _session_factory = None
 
     @classmethod
-    def initialize(cls, database_url: str, echo: bool = False):
+    def initialize(cls, database_url: str, echo: bool = False, pool_size: int = 20, max_overflow: int = 10,
+                   pool_timeout: int = 30, pool_recycle: int = 1800):
         """Initialize the async engine and sessionmaker."""
         if cls._engine is None:  # Ensure engine is created once
-            cls._engine = create_async_engine(database_url, echo=echo, future=True)
+            cls._engine = create_async_engine(
+                database_url,
+                echo=echo,
+                future=True,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
+                pool_recycle=pool_recycle,
+                pool_pre_ping=True,  # Drop connections the server closed while idle
+            )
             cls._session_factory = sessionmaker(
                 bind=cls._engine, class_=AsyncSession, expire_on_commit=False, future=True
             )
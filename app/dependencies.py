@@ -8,6 +8,7 @@ from app.services.email_service import EmailService
 from app.services.jwt_service import decode_token
 from settings.config import Settings
 from fastapi import Depends
+from typing import Iterable
 from uuid import UUID
 
 def get_settings() -> Settings:
@@ -46,9 +47,10 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
         raise credentials_exception
     return {"user_id": user_id, "role": user_role, "user_uuid": user_uuid}
 
-def require_role(role: str):
+def require_role(roles: Iterable[str]):
+    allowed_roles = frozenset(roles)
     def role_checker(current_user: dict = Depends(get_current_user)):
-        if current_user["role"] not in role:
+        if current_user["role"] not in allowed_roles:
             raise HTTPException(status_code=403, detail="Operation not permitted")
         return current_user
     return role_checker
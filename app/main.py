@@ -1,7 +1,10 @@
 from builtins import Exception
+import anyio
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from starlette.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware  # Import the CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 from app.database import Database
 from app.dependencies import get_settings
 from app.routers import user_routes
@@ -16,6 +19,7 @@ app = FastAPI(
         "email": "support@example.com",
     },
     license_info={"name": "MIT", "url": "https://opensource.org/licenses/MIT"},
+    default_response_class=ORJSONResponse,  # orjson serializes UUIDs/datetimes natively and much faster
 )
 # CORS middleware configuration
 # This middleware will enable CORS and allow requests from any origin
@@ -27,11 +31,22 @@ app.add_middleware(
     allow_methods=["*"],  # Allowed HTTP methods
     allow_headers=["*"],  # Allowed HTTP headers
 )
+# Compress larger JSON bodies such as user listings; small responses are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 @app.on_event("startup")
 async def startup_event():
     settings = get_settings()
-    Database.initialize(settings.database_url, settings.debug)
+    Database.initialize(
+        settings.database_url,
+        settings.debug,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
+    # Blocking MinIO calls run in worker threads; raise anyio's default limit of 40
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.thread_pool_size
 
 @app.exception_handler(Exception)
 async def exception_handler(request, exc):
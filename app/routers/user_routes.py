@@ -18,10 +18,13 @@ Key Highlights:
 - Utilizes OAuth2PasswordBearer for securing API endpoints, requiring valid access tokens for operations.
 """
 
-from builtins import dict, int, len, str
+from builtins import ValueError, dict, int, len, str
 from datetime import timedelta
+from typing import Optional
 from uuid import UUID
-from fastapi import  FastAPI, APIRouter, Depends, HTTPException, Response, status, Request, UploadFile, File
+from fastapi import  APIRouter, Depends, HTTPException, Query, Response, status, Request, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import RedirectResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.dependencies import get_current_user, get_db, get_email_service, require_role
@@ -30,23 +33,39 @@ from app.schemas.token_schema import TokenResponse
 from app.schemas.user_schemas import LoginRequest, UserBase, UserCreate, UserListResponse, UserResponse, UserUpdate
 from app.services.user_service import UserService
 from app.services.jwt_service import create_access_token
-from app.utils.link_generation import create_user_links, generate_pagination_links
+from app.utils.cursor import decode_cursor
+from app.utils.etag import compute_etag, etag_matches
+from app.utils.link_generation import create_user_links, generate_cursor_pagination_links
 from app.dependencies import get_settings
 from app.services.email_service import EmailService
 
-from app.utils.minio_client import upload_profile_picture, get_profile_picture_url
-from sqlalchemy.future import select
-from io import BytesIO
+from app.utils.minio_client import ALLOWED_CONTENT_TYPES, ALLOWED_EXTENSIONS, upload_profile_picture, get_cached_profile_picture_url, presigned_url_cache
+from sqlalchemy import update
 from app.models.user_model import User
 import logging
+import os
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-app = FastAPI()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 settings = get_settings()
+
+# Shared role checkers, built once instead of per route
+_ADMIN_OR_MANAGER = require_role(("ADMIN", "MANAGER"))
+_ANY_AUTHENTICATED = require_role(("ADMIN", "MANAGER", "AUTHENTICATED"))
+
+# Copy only the attributes UserResponse declares, rather than splatting ORM internals;
+# links are generated per request rather than read off the row
+_USER_RESPONSE_FIELDS = tuple(field for field in UserResponse.model_fields if field != "links")
+
+def _build_user_response(user: User, request: Request) -> UserResponse:
+    """Builds a UserResponse from a trusted ORM row without re-running validation."""
+    data = {field: getattr(user, field) for field in _USER_RESPONSE_FIELDS}
+    data["links"] = create_user_links(user.id, request)
+    return UserResponse.model_construct(**data)
+
 @router.get("/users/{user_id}", response_model=UserResponse, name="get_user", tags=["User Management Requires (Admin or Manager Roles)"])
-async def get_user(user_id: UUID, request: Request, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+async def get_user(user_id: UUID, request: Request, response: Response, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(_ADMIN_OR_MANAGER)):
     """
     Endpoint to fetch a user by their unique identifier (UUID).
 
@@ -58,27 +77,19 @@ async def get_user(user_id: UUID, request: Request, db: AsyncSession = Depends(g
         request: The request object, used to generate full URLs in the response.
         db: Dependency that provides an AsyncSession for database access.
         token: The OAuth2 access token obtained through OAuth2PasswordBearer dependency.
+
+    Responds with 304 Not Modified when the client's If-None-Match already matches the user's ETag.
     """
     user = await UserService.get_by_id(db, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    return UserResponse.model_construct(
-        id=user.id,
-        nickname=user.nickname,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        bio=user.bio,
-        profile_picture_url=user.profile_picture_url,
-        github_profile_url=user.github_profile_url,
-        linkedin_profile_url=user.linkedin_profile_url,
-        role=user.role,
-        email=user.email,
-        last_login_at=user.last_login_at,
-        created_at=user.created_at,
-        updated_at=user.updated_at,
-        links=create_user_links(user.id, request)  
-    )
+    etag = compute_etag([(user.id, user.updated_at)])
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    return _build_user_response(user, request)
 
 # Additional endpoints for update, delete, create, and list users follow a similar pattern, using
 # asynchronous database operations, handling security with OAuth2PasswordBearer, and enhancing response
@@ -88,7 +99,7 @@ async def get_user(user_id: UUID, request: Request, db: AsyncSession = Depends(g
 # experience by adhering to REST principles and providing self-discoverable operations.
 
 @router.put("/users/{user_id}", response_model=UserResponse, name="update_user", tags=["User Management Requires (Admin or Manager Roles)"])
-async def update_user(user_id: UUID, user_update: UserUpdate, request: Request, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+async def update_user(user_id: UUID, user_update: UserUpdate, request: Request, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(_ADMIN_OR_MANAGER)):
     """
     Update user information.
 
@@ -100,26 +111,11 @@ async def update_user(user_id: UUID, user_update: UserUpdate, request: Request,
     if not updated_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    return UserResponse.model_construct(
-        id=updated_user.id,
-        bio=updated_user.bio,
-        first_name=updated_user.first_name,
-        last_name=updated_user.last_name,
-        nickname=updated_user.nickname,
-        email=updated_user.email,
-        role=updated_user.role,
-        last_login_at=updated_user.last_login_at,
-        profile_picture_url=updated_user.profile_picture_url,
-        github_profile_url=updated_user.github_profile_url,
-        linkedin_profile_url=updated_user.linkedin_profile_url,
-        created_at=updated_user.created_at,
-        updated_at=updated_user.updated_at,
-        links=create_user_links(updated_user.id, request)
-    )
+    return _build_user_response(updated_user, request)
 
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT, name="delete_user", tags=["User Management Requires (Admin or Manager Roles)"])
-async def delete_user(user_id: UUID, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+async def delete_user(user_id: UUID, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(_ADMIN_OR_MANAGER)):
     """
     Delete a user by their ID.
 
@@ -133,7 +129,7 @@ async def delete_user(user_id: UUID, db: AsyncSession = Depends(get_db), token:
 
 
 @router.post("/users/", response_model=UserResponse, status_code=status.HTTP_201_CREATED, tags=["User Management Requires (Admin or Manager Roles)"], name="create_user")
-async def create_user(user: UserCreate, request: Request, db: AsyncSession = Depends(get_db), email_service: EmailService = Depends(get_email_service), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+async def create_user(user: UserCreate, request: Request, db: AsyncSession = Depends(get_db), email_service: EmailService = Depends(get_email_service), token: str = Depends(oauth2_scheme), current_user: dict = Depends(_ADMIN_OR_MANAGER)):
     """
     Create a new user.
 
@@ -158,46 +154,49 @@ async def create_user(user: UserCreate, request: Request, db: AsyncSession = Dep
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create user")
     
     
-    return UserResponse.model_construct(
-        id=created_user.id,
-        bio=created_user.bio,
-        first_name=created_user.first_name,
-        last_name=created_user.last_name,
-        profile_picture_url=created_user.profile_picture_url,
-        nickname=created_user.nickname,
-        email=created_user.email,
-        role=created_user.role,
-        last_login_at=created_user.last_login_at,
-        created_at=created_user.created_at,
-        updated_at=created_user.updated_at,
-        links=create_user_links(created_user.id, request)
-    )
+    return _build_user_response(created_user, request)
 
 
 @router.get("/users/", response_model=UserListResponse, tags=["User Management Requires (Admin or Manager Roles)"])
 async def list_users(
     request: Request,
-    skip: int = 0,
-    limit: int = 10,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
-    current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))
+    current_user: dict = Depends(_ADMIN_OR_MANAGER)
 ):
-    total_users = await UserService.count(db)
-    users = await UserService.list_users(db, skip, limit)
+    """
+    List users using keyset pagination.
+
+    - **cursor**: Opaque cursor returned as `next_cursor` by the previous page; omit for the first page.
+    - **limit**: Maximum number of users to return.
+
+    Responds with 304 Not Modified when the page's ETag matches the client's If-None-Match.
+    """
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    users, next_cursor = await UserService.list_users(db, limit, position)
+
+    etag = compute_etag(((user.id, user.updated_at) for user in users), next_cursor or "")
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
 
-    user_responses = [
-        UserResponse.model_validate(user) for user in users
-    ]
+    # Rows come straight from the ORM, so skip re-validating every field
+    user_responses = [_build_user_response(user, request) for user in users]
     
-    pagination_links = generate_pagination_links(request, skip, limit, total_users)
+    pagination_links = generate_cursor_pagination_links(request, limit, next_cursor)
     
     # Construct the final response with pagination details
     return UserListResponse(
         items=user_responses,
-        total=total_users,
-        page=skip // limit + 1,
         size=len(user_responses),
-        links=pagination_links  # Ensure you have appropriate logic to create these links
+        next_cursor=next_cursor,
+        links=pagination_links
     )
 
 
@@ -256,72 +255,61 @@ async def verify_email(user_id: UUID, token: str, db: AsyncSession = Depends(get
     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired verification token")
 
 ## 
-@router.get("/profile-picture/{file_name}")
-def get_profile_picture(file_name: str):
+@router.get("/profile-picture/{file_name}", response_class=RedirectResponse, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+async def get_profile_picture(file_name: str):
+    """
+    Redirect to a presigned MinIO URL for the given profile picture, so clients load it in one hop.
+    """
     try:
-        url = get_profile_picture_url(file_name)
-        return {"url": url}
+        url = await get_cached_profile_picture_url(file_name)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-from uuid import uuid4  # Ensure this import is present
+    return RedirectResponse(
+        url,
+        status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+        headers={"Cache-Control": f"private, max-age={presigned_url_cache.ttl}"},
+    )
+
 @router.post("/users/me/upload-profile-picture")
 async def upload_profile_picture_endpoint(
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user),
-    _=Depends(require_role(["ADMIN", "MANAGER", "AUTHENTICATED"]))
+    _=Depends(_ANY_AUTHENTICATED)
 ):
-    if not file.content_type.startswith('image/'):
-        raise HTTPException(status_code=400, detail="Invalid file type. Only images are allowed.")
-    file_data = await file.read()
-    data_stream = BytesIO(file_data)
-    random_filename = uuid4()
+    # Reject unsupported files before any of the upload is streamed anywhere
+    file_extension = (file.filename or "").rsplit('.', 1)[-1].lower()
+    if file_extension not in ALLOWED_EXTENSIONS or file.content_type not in ALLOWED_CONTENT_TYPES:
+        raise HTTPException(status_code=400, detail="Invalid file type. Only JPEG, PNG and GIF images are allowed.")
+    file_size = file.size
+    if file_size is None:
+        file.file.seek(0, os.SEEK_END)
+        file_size = file.file.tell()
+        file.file.seek(0)
+    if file_size > settings.max_profile_picture_size:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Profile picture is too large.")
     user_id = current_user["user_id"]
-    file_extension = file.filename.split('.')[-1]
     secure_filename = f"{user_id}.{file_extension}"
     try:
-        # Replace this with actual MinIO upload logic and URL retrieval
-        url = upload_profile_picture(data_stream, secure_filename)
-        # Update the current user's profile picture URL in the database
-        user_id = current_user["user_id"]  # Accessing the user_id from the current_user dictionary
-        stmt = select(User).where(User.id == user_id)
+        # Stream the spooled upload straight to MinIO without buffering it in memory
+        url = await run_in_threadpool(upload_profile_picture, file.file, secure_filename, file.content_type, file_size)
+        # Update the current user's profile picture URL in a single round-trip
+        stmt = (
+            update(User)
+            .where(User.id == UUID(user_id))
+            .values(profile_picture_url=url)
+            .returning(User.id)
+        )
         result = await db.execute(stmt)
-        user = result.scalar_one_or_none()
-        if user is None:
+        if result.scalar_one_or_none() is None:
             raise HTTPException(status_code=404, detail="User not found")
-        user.profile_picture_url = url
-        db.add(user)
         await db.commit()
-        await db.refresh(user)
-        logger.debug(f"Profile picture URL updated for user: {user.id}, URL: {user.profile_picture_url}")
+        logger.debug(f"Profile picture URL updated for user: {user_id}, URL: {url}")
         return {"message": "Profile picture uploaded successfully.", "profile_picture_url": url}
+    except HTTPException:
+        await db.rollback()
+        raise
     except Exception as e:
         await db.rollback()
         logger.error(f"Failed to upload image: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to upload image: {str(e)}")
-    
-# Example endpoint to upload profile picture
-@app.post("/upload-profile-picture/")
-async def upload_profile_picture_endpoint(file: UploadFile = File(...)):
-    try:
-        # Read the uploaded file content as bytes
-        file_content = await file.read()
-
-        # Call the minio client to upload the profile picture
-        file_url = upload_profile_picture(file_content, file.filename)
-
-        return {"file_url": file_url}
-    
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-
-# Example endpoint to get the profile picture URL
-@app.get("/get-profile-picture/{file_name}")
-async def get_profile_picture_endpoint(file_name: str):
-    try:
-        # Get the URL of the profile picture
-        file_url = get_profile_picture_url(file_name)
-        return {"file_url": file_url}
-    
-    except Exception as e:
-        raise HTTPException(status_code=404, detail=f"File not found: {e}")
\ No newline at end of file
@@ -7,6 +7,8 @@ from enum import Enum
 import uuid
 import re
 from app.models.user_model import UserRole
+from app.schemas.link_schema import Link
+from app.schemas.pagination_schema import PaginationLink
 from app.utils.nickname_gen import generate_nickname
 
 
@@ -84,6 +86,7 @@ class UserResponse(UserBase):
     nickname: Optional[str] = Field(None, min_length=3, pattern=r'^[\w-]+$', example=generate_nickname())    
     is_professional: Optional[bool] = Field(default=False, example=True)
     role: UserRole
+    links: List[Link] = Field(default=[], description="HATEOAS links for actions on this user.")
 
 class LoginRequest(BaseModel):
     email: str = Field(..., example="john.doe@example.com")
@@ -102,6 +105,6 @@ class UserListResponse(BaseModel):
         "linkedin_profile_url": "https://linkedin.com/in/johndoe", 
         "github_profile_url": "https://github.com/johndoe"
     }])
-    total: int = Field(..., example=100)
-    page: int = Field(..., example=1)
     size: int = Field(..., example=10)
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for fetching the next page.", example="MjAyNC0wNC0yMVQwOTo1MTo0NCswMDowMHw0ZjNi")
+    links: List[PaginationLink] = []
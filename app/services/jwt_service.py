@@ -1,8 +1,15 @@
 # app/services/jwt_service.py
 from builtins import dict, str
+import hashlib
+import time
 import jwt
 from datetime import datetime, timedelta
 from settings.config import settings
+from app.utils.ttl_cache import TTLCache
+
+# Verified token payloads keyed by the token's SHA-256 digest. Keep the TTL short:
+# it is the longest a cached token is honoured without re-checking its signature.
+_token_cache = TTLCache(ttl=60)
 
 def create_access_token(*, data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
@@ -14,9 +21,23 @@ def create_access_token(*, data: dict, expires_delta: timedelta = None):
     encoded_jwt = jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
     return encoded_jwt
 
+def _token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
 def decode_token(token: str):
+    key = _token_key(token)
+    cached = _token_cache.get(key)
+    if cached is not None:
+        return cached
     try:
         decoded = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        return decoded
     except jwt.PyJWTError:
         return None
+    # Never keep a payload past the token's own expiry
+    exp = decoded.get("exp")
+    _token_cache.set(key, decoded, None if exp is None else exp - time.time())
+    return decoded
+
+def invalidate_token(token: str):
+    """Drops a token from the verification cache, e.g. on logout."""
+    _token_cache.pop(_token_key(token))
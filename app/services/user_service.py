@@ -1,9 +1,9 @@
-from builtins import Exception, bool, classmethod, int, str
+from builtins import Exception, bool, classmethod, int, len, str, tuple
 from datetime import datetime, timezone
 import secrets
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from pydantic import ValidationError
-from sqlalchemy import func, null, update, select
+from sqlalchemy import func, null, update, select, tuple_
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.dependencies import get_email_service, get_settings
@@ -11,6 +11,7 @@ from app.models.user_model import User
 from app.schemas.user_schemas import UserCreate, UserUpdate
 from app.utils.nickname_gen import generate_nickname
 from app.utils.security import generate_verification_token, hash_password, verify_password
+from app.utils.cursor import encode_cursor
 from uuid import UUID
 from app.services.email_service import EmailService
 from app.models.user_model import UserRole
@@ -114,10 +115,25 @@ class UserService:
         return True
 
     @classmethod
-    async def list_users(cls, session: AsyncSession, skip: int = 0, limit: int = 10) -> List[User]:
-        query = select(User).offset(skip).limit(limit)
+    async def list_users(cls, session: AsyncSession, limit: int = 10, cursor: Optional[Tuple[datetime, UUID]] = None) -> Tuple[List[User], Optional[str]]:
+        """
+        List users using keyset pagination over the (created_at, id) index.
+
+        :param session: The AsyncSession instance for database access.
+        :param limit: Maximum number of users to return.
+        :param cursor: Decoded (created_at, id) position to start after, or None for the first page.
+        :return: The page of users and the cursor for the next page, if any.
+        """
+        query = select(User).order_by(User.created_at, User.id).limit(limit + 1)
+        if cursor is not None:
+            query = query.where(tuple_(User.created_at, User.id) > tuple(cursor))
         result = await cls._execute_query(session, query)
-        return result.scalars().all() if result else []
+        users = result.scalars().all() if result else []
+        if len(users) <= limit:
+            return users, None
+        users = users[:limit]
+        last = users[-1]
+        return users, encode_cursor(last.created_at, last.id)
 
     @classmethod
     async def register_user(cls, session: AsyncSession, user_data: Dict[str, str], get_email_service) -> Optional[User]:
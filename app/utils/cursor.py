@@ -0,0 +1,42 @@
+from builtins import ValueError, str
+import base64
+import binascii
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, user_id: UUID) -> str:
+    """
+    Encodes a keyset position into an opaque, URL-safe cursor.
+
+    Args:
+        created_at (datetime): Creation timestamp of the last row on the page.
+        user_id (UUID): Identifier of the last row on the page.
+
+    Returns:
+        str: The base64url encoded cursor.
+    """
+    raw = f"{created_at.isoformat()}|{user_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decodes a cursor produced by `encode_cursor` back into its keyset position.
+
+    Args:
+        cursor (str): The base64url encoded cursor.
+
+    Returns:
+        Tuple[datetime, UUID]: The (created_at, id) pair the next page starts after.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, user_id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(user_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
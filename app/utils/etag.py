@@ -0,0 +1,46 @@
+from builtins import bool, str
+import hashlib
+from typing import Iterable, Tuple
+from uuid import UUID
+from datetime import datetime
+
+from fastapi import Request
+
+
+def compute_etag(versions: Iterable[Tuple[UUID, datetime]], extra: str = "") -> str:
+    """
+    Builds a weak ETag from the (id, updated_at) pairs of the rows in a response.
+
+    The tag is weak because it describes the rows rather than the bytes sent: the same
+    tag is served whether or not GZipMiddleware compresses the body.
+
+    Args:
+        versions: The identity and last modification time of every row returned.
+        extra: Any other response state that should change the ETag, such as a pagination cursor.
+
+    Returns:
+        str: A weak ETag header value (W/"...").
+    """
+    digest = hashlib.md5(extra.encode("utf-8"), usedforsecurity=False)
+    for row_id, updated_at in versions:
+        digest.update(f"{row_id}:{updated_at.timestamp() if updated_at else ''};".encode("utf-8"))
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _opaque_tag(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Checks whether the request's If-None-Match header already names the given ETag.
+
+    Uses the weak comparison If-None-Match calls for, so W/ prefixes are ignored on both sides.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque_tag = _opaque_tag(etag)
+    return any(_opaque_tag(candidate.strip()) == opaque_tag for candidate in header.split(","))
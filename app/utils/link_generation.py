@@ -1,5 +1,5 @@
-from builtins import dict, int, max, str
-from typing import List, Callable
+from builtins import dict, int, len, max, str
+from typing import Dict, List, Callable, Optional, Tuple
 from urllib.parse import urlencode
 from uuid import UUID
 
@@ -16,18 +16,39 @@ def create_pagination_link(rel: str, base_url: str, params: dict) -> PaginationL
     query_string = f"skip={params['skip']}&limit={params['limit']}"
     return PaginationLink(rel=rel, href=f"{base_url}?{query_string}")
 
+_USER_LINK_ACTIONS = (
+    ("self", "get_user", "GET", "view"),
+    ("update", "update_user", "PUT", "update"),
+    ("delete", "delete_user", "DELETE", "delete")
+)
+_USER_ID_PLACEHOLDER = "__user_id__"
+# Resolved link templates per base URL; bounded since the base URL follows the Host header
+_MAX_USER_LINK_TEMPLATES = 32
+_user_link_templates: Dict[str, List[Tuple[str, str, str, str]]] = {}
+
+def _get_user_link_templates(request: Request) -> List[Tuple[str, str, str, str]]:
+    base_url = str(request.base_url)
+    templates = _user_link_templates.get(base_url)
+    if templates is None:
+        if len(_user_link_templates) >= _MAX_USER_LINK_TEMPLATES:
+            _user_link_templates.clear()
+        templates = [
+            (rel, str(request.url_for(action, user_id=_USER_ID_PLACEHOLDER)), method, action_desc)
+            for rel, action, method, action_desc in _USER_LINK_ACTIONS
+        ]
+        _user_link_templates[base_url] = templates
+    return templates
+
 def create_user_links(user_id: UUID, request: Request) -> List[Link]:
     """
     Generate navigation links for user actions.
+
+    Route lookups happen once per base URL; afterwards only the user id is substituted.
     """
-    actions = [
-        ("self", "get_user", "GET", "view"),
-        ("update", "update_user", "PUT", "update"),
-        ("delete", "delete_user", "DELETE", "delete")
-    ]
+    user_id = str(user_id)
     return [
-        create_link(rel, str(request.url_for(action, user_id=str(user_id))), method, action_desc)
-        for rel, action, method, action_desc in actions
+        create_link(rel, href.replace(_USER_ID_PLACEHOLDER, user_id), method, action_desc)
+        for rel, href, method, action_desc in _get_user_link_templates(request)
     ]
 
 def generate_pagination_links(request: Request, skip: int, limit: int, total_items: int) -> List[PaginationLink]:
@@ -46,3 +67,15 @@ def generate_pagination_links(request: Request, skip: int, limit: int, total_ite
         links.append(create_pagination_link("prev", base_url, {'skip': max(skip - limit, 0), 'limit': limit}))
 
     return links
+
+def generate_cursor_pagination_links(request: Request, limit: int, next_cursor: Optional[str]) -> List[PaginationLink]:
+    base_url = str(request.url).split("?", 1)[0]
+    links = [
+        PaginationLink(rel="self", href=str(request.url)),
+        PaginationLink(rel="first", href=f"{base_url}?{urlencode({'limit': limit})}"),
+    ]
+
+    if next_cursor is not None:
+        links.append(PaginationLink(rel="next", href=f"{base_url}?{urlencode({'cursor': next_cursor, 'limit': limit})}"))
+
+    return links
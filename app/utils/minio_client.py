@@ -1,8 +1,25 @@
 from minio import Minio
 from minio.error import S3Error
 from settings.config import settings
+from app.utils.ttl_cache import TTLCache
+from fastapi.concurrency import run_in_threadpool
+import asyncio
+import certifi
 import os
-
+import threading
+import urllib3
+from urllib.parse import quote
+
+
+# Same settings as the MinIO SDK's default pool, but with room for more concurrent connections
+_http_timeout = 5 * 60
+http_client = urllib3.PoolManager(
+    maxsize=32,
+    timeout=urllib3.Timeout(connect=_http_timeout, read=_http_timeout),
+    cert_reqs="CERT_REQUIRED",
+    ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+    retries=urllib3.Retry(total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
+)
 
 # Initialize MinIO client
 minio_client = Minio(
@@ -10,8 +27,19 @@ minio_client = Minio(
     access_key=os.environ.get("MINIO_ROOT_USER"),
     secret_key=os.environ.get("MINIO_ROOT_PASSWORD"),
     secure=settings.MINIO_USE_SSL,
+    http_client=http_client,
 )
 
+# Accepted profile picture formats
+ALLOWED_EXTENSIONS = frozenset({"jpg", "jpeg", "png", "gif"})
+ALLOWED_CONTENT_TYPES = frozenset({"image/jpeg", "image/png", "image/gif"})
+
+# Public URL prefix for stored objects, computed once
+_object_url_prefix = f"{'https' if settings.MINIO_USE_SSL else 'http'}://{settings.MINIO_ENDPOINT}/{settings.MINIO_BUCKET_NAME}/"
+
+_bucket_ready = False
+_bucket_lock = threading.Lock()
+
 
 # Ensure the bucket exists
 def ensure_bucket_exists(bucket_name):
@@ -31,37 +59,52 @@ def ensure_bucket_exists(bucket_name):
         print("Error ensuring bucket existence:", exc)
 
 
+def _ensure_bucket_ready():
+    """
+    Makes sure the configured bucket exists, checking MinIO only on the first call.
+    """
+    global _bucket_ready
+    if _bucket_ready:
+        return
+    with _bucket_lock:
+        if not _bucket_ready:
+            if not minio_client.bucket_exists(settings.MINIO_BUCKET_NAME):
+                minio_client.make_bucket(settings.MINIO_BUCKET_NAME)
+            _bucket_ready = True
+
+
 # Upload profile picture
-def upload_profile_picture(file_data, file_name):
+def upload_profile_picture(file_data, file_name, content_type, length=-1):
     """
     Uploads a profile picture to MinIO.
 
     Args:
-        file_data (bytes): File content to upload.
+        file_data (BinaryIO): Readable stream with the file content to upload.
         file_name (str): Name of the file.
+        content_type (str): MIME type stored on the object so browsers can render it inline.
+        length (int): Size of the stream in bytes, or -1 if unknown.
 
     Returns:
         str: URL to the uploaded file.
 
     Raises:
-        ValueError: If the file type is unsupported.
+        ValueError: If the content type is unsupported.
     """
-    allowed_extensions = {"jpg", "jpeg", "png", "gif"}
-    file_extension = file_name.split(".")[-1].lower()
-
-    if file_extension not in allowed_extensions:
+    if content_type not in ALLOWED_CONTENT_TYPES:
         raise ValueError("Unsupported file type")
 
     try:
+        _ensure_bucket_ready()
         minio_client.put_object(
             settings.MINIO_BUCKET_NAME,
             file_name,
             file_data,
-            length=-1,  # Automatically determine content length
-            part_size=10 * 1024 * 1024  # Set part size to 10 MB
+            length=length,  # -1 lets MinIO stream it as a multipart upload
+            part_size=10 * 1024 * 1024,  # Set part size to 10 MB
+            content_type=content_type,
         )
         print(f"File '{file_name}' successfully uploaded to bucket '{settings.MINIO_BUCKET_NAME}'.")
-        return f"{settings.MINIO_ENDPOINT}/{settings.MINIO_BUCKET_NAME}/{file_name}"
+        return _object_url_prefix + quote(file_name, safe="")
     except S3Error as exc:
         print("Error uploading file:", exc)
         raise
@@ -87,6 +130,42 @@ def get_profile_picture_url(file_name):
         raise
 
 
+# Presigned URLs keyed by file name; the TTL stays well below MinIO's presign expiry
+presigned_url_cache = TTLCache(ttl=3000)
+# Presign requests currently running, so concurrent misses for one file share a single call
+_presign_in_flight = {}
+
+
+async def _presign_and_cache(file_name):
+    url = await run_in_threadpool(get_profile_picture_url, file_name)
+    presigned_url_cache.set(file_name, url)
+    return url
+
+
+async def get_cached_profile_picture_url(file_name):
+    """
+    Returns a presigned URL for a profile picture, served from the cache when possible.
+
+    On a cache miss only one presign call runs per file name; concurrent callers await its result.
+
+    Args:
+        file_name (str): Name of the file.
+
+    Returns:
+        str: Presigned URL for the file.
+    """
+    url = presigned_url_cache.get(file_name)
+    if url is not None:
+        return url
+    task = _presign_in_flight.get(file_name)
+    if task is None:
+        task = asyncio.ensure_future(_presign_and_cache(file_name))
+        _presign_in_flight[file_name] = task
+        task.add_done_callback(lambda _: _presign_in_flight.pop(file_name, None))
+    # Shield the shared call so one cancelled caller doesn't cancel it for everyone else
+    return await asyncio.shield(task)
+
+
 # Main function for testing
 if __name__ == "__main__":
     try:
@@ -98,7 +177,7 @@ if __name__ == "__main__":
         file_name = "njit.jpeg"
 
         with open(file_path, "rb") as file_data:
-            upload_profile_picture(file_data, file_name)
+            upload_profile_picture(file_data, file_name, "image/jpeg")
 
         # Example of generating a presigned URL
         presigned_url = get_profile_picture_url(file_name)
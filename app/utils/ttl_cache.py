@@ -0,0 +1,46 @@
+from builtins import len, min, next, iter
+import threading
+import time
+
+
+class TTLCache:
+    """
+    Small in-process cache whose entries expire after a fixed time-to-live.
+
+    Once `maxsize` entries are held the oldest one is evicted to make room. Access is
+    guarded by a lock so the cache can be shared by sync dependencies running in worker threads.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 10_000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                self._entries.pop(key, None)
+                return None
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        """Stores a value; `ttl` may shorten, but never extend, the cache's default lifetime."""
+        lifetime = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.maxsize:
+                # Evict the oldest entry; dicts preserve insertion order
+                self._entries.pop(next(iter(self._entries)), None)
+            self._entries[key] = (value, time.monotonic() + lifetime)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -1,11 +1,18 @@
 from builtins import str
+from datetime import datetime, timezone
+import io
+from tempfile import SpooledTemporaryFile
+from unittest.mock import patch
+from uuid import uuid4
 import pytest
 from httpx import AsyncClient
 from app.main import app
 from app.models.user_model import User, UserRole
+from app.routers import user_routes
+from app.utils.minio_client import minio_client, presigned_url_cache
 from app.utils.nickname_gen import generate_nickname
 from app.utils.security import hash_password
-from app.services.jwt_service import decode_token  # Import your FastAPI app
+from app.services.jwt_service import create_access_token, decode_token  # Import your FastAPI app
 
 # Example of a test function using the async_client fixture
 @pytest.mark.asyncio
@@ -36,6 +43,26 @@ async def test_retrieve_user_access_allowed(async_client, admin_user, admin_toke
     assert response.status_code == 200
     assert response.json()["id"] == str(admin_user.id)
 
+@pytest.mark.asyncio
+async def test_retrieve_user_includes_links(async_client, admin_user, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get(f"/users/{admin_user.id}", headers=headers)
+    assert response.status_code == 200
+    links = {link["rel"]: link for link in response.json()["links"]}
+    assert set(links) == {"self", "update", "delete"}
+    assert links["self"]["href"] == f"http://testserver/users/{admin_user.id}"
+    assert links["update"]["action"] == "update"
+    assert links["delete"]["action"] == "delete"
+
+@pytest.mark.asyncio
+async def test_list_users_items_include_links(async_client, admin_user, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/", headers=headers)
+    assert response.status_code == 200
+    for item in response.json()["items"]:
+        hrefs = {link["rel"]: link["href"] for link in item["links"]}
+        assert hrefs["self"] == f"http://testserver/users/{item['id']}"
+
 @pytest.mark.asyncio
 async def test_update_user_email_access_denied(async_client, verified_user, user_token):
     updated_data = {"email": f"updated_{verified_user.id}@example.com"}
@@ -190,3 +217,140 @@ async def test_list_users_unauthorized(async_client, user_token):
         headers={"Authorization": f"Bearer {user_token}"}
     )
     assert response.status_code == 403  # Forbidden, as expected for regular user
+
+@pytest.mark.asyncio
+async def test_retrieve_user_not_modified(async_client, admin_user, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get(f"/users/{admin_user.id}", headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    cached = await async_client.get(f"/users/{admin_user.id}", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+@pytest.mark.asyncio
+async def test_list_users_not_modified(async_client, admin_user, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/", headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    cached = await async_client.get("/users/", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+@pytest.mark.asyncio
+async def test_retrieve_user_etag_changes_after_update(async_client, admin_user, admin_token, db_session):
+    # Backdate the row so the update's server timestamp always differs from it
+    admin_user.updated_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    await db_session.commit()
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get(f"/users/{admin_user.id}", headers=headers)
+    etag = response.headers["ETag"]
+
+    update_response = await async_client.put(f"/users/{admin_user.id}", json={"first_name": "Renamed"}, headers=headers)
+    assert update_response.status_code == 200
+
+    refreshed = await async_client.get(f"/users/{admin_user.id}", headers={**headers, "If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+    assert refreshed.json()["first_name"] == "Renamed"
+
+@pytest.fixture
+def clear_presigned_url_cache():
+    presigned_url_cache.clear()
+    yield
+    presigned_url_cache.clear()
+
+@pytest.mark.asyncio
+async def test_get_profile_picture_redirects_to_presigned_url(async_client, clear_presigned_url_cache):
+    presigned = "http://minio:9000/demo/avatar.png?X-Amz-Signature=abc"
+    with patch.object(minio_client, "get_presigned_url", return_value=presigned) as mock_presign:
+        response = await async_client.get("/profile-picture/avatar.png", follow_redirects=False)
+    assert response.status_code == 307
+    assert response.headers["Location"] == presigned
+    assert response.headers["Cache-Control"] == "private, max-age=3000"
+    mock_presign.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_get_profile_picture_presign_failure(async_client, clear_presigned_url_cache):
+    with patch.object(minio_client, "get_presigned_url", side_effect=RuntimeError("MinIO unavailable")):
+        response = await async_client.get("/profile-picture/avatar.png", follow_redirects=False)
+    assert response.status_code == 500
+    assert response.json()["detail"] == "MinIO unavailable"
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("file_name, content_type", [
+    ("avatar.txt", "image/png"),
+    ("avatar.png", "text/plain"),
+])
+async def test_upload_profile_picture_invalid_type(async_client, user_token, file_name, content_type):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    with patch.object(minio_client, "put_object") as mock_put:
+        response = await async_client.post(
+            "/users/me/upload-profile-picture",
+            files={"file": (file_name, io.BytesIO(PNG_BYTES), content_type)},
+            headers=headers
+        )
+    assert response.status_code == 400
+    assert "Invalid file type" in response.json()["detail"]
+    mock_put.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_upload_profile_picture_too_large(async_client, user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    with patch.object(user_routes.settings, "max_profile_picture_size", len(PNG_BYTES) - 1), \
+            patch.object(minio_client, "put_object") as mock_put:
+        response = await async_client.post(
+            "/users/me/upload-profile-picture",
+            files={"file": ("avatar.png", io.BytesIO(PNG_BYTES), "image/png")},
+            headers=headers
+        )
+    assert response.status_code == 413
+    mock_put.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_upload_profile_picture_user_not_found(async_client, db_session):
+    missing_id = str(uuid4())
+    token = create_access_token(data={"sub": missing_id, "role": UserRole.AUTHENTICATED.name, "id": missing_id})
+    headers = {"Authorization": f"Bearer {token}"}
+    with patch.object(minio_client, "bucket_exists", return_value=True), \
+            patch.object(minio_client, "put_object"), \
+            patch.object(db_session, "rollback", wraps=db_session.rollback) as mock_rollback:
+        response = await async_client.post(
+            "/users/me/upload-profile-picture",
+            files={"file": ("avatar.png", io.BytesIO(PNG_BYTES), "image/png")},
+            headers=headers
+        )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "User not found"
+    mock_rollback.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_upload_profile_picture_success(async_client, user, user_token, db_session):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    with patch.object(minio_client, "bucket_exists", return_value=True), \
+            patch.object(minio_client, "put_object") as mock_put:
+        response = await async_client.post(
+            "/users/me/upload-profile-picture",
+            files={"file": ("avatar.png", io.BytesIO(PNG_BYTES), "image/png")},
+            headers=headers
+        )
+    assert response.status_code == 200
+    assert response.json()["profile_picture_url"].endswith(f"{user.id}.png")
+
+    mock_put.assert_called_once()
+    _, object_name, data = mock_put.call_args.args
+    assert object_name == f"{user.id}.png"
+    assert isinstance(data, SpooledTemporaryFile)
+    assert mock_put.call_args.kwargs["length"] == len(PNG_BYTES)
+    assert mock_put.call_args.kwargs["content_type"] == "image/png"
+
+    await db_session.refresh(user)
+    assert user.profile_picture_url == response.json()["profile_picture_url"]
@@ -0,0 +1,17 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.utils.cursor import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 4, 21, 9, 51, 44, 977108, tzinfo=timezone.utc)
+    user_id = uuid4()
+    assert decode_cursor(encode_cursor(created_at, user_id)) == (created_at, user_id)
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "", "bm8tc2VwYXJhdG9y"])
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
@@ -0,0 +1,37 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+from fastapi import Request
+
+from app.utils.etag import compute_etag, etag_matches
+
+
+def make_request(if_none_match=None):
+    request = MagicMock(spec=Request)
+    request.headers = {"if-none-match": if_none_match} if if_none_match else {}
+    return request
+
+def test_compute_etag_changes_with_updated_at():
+    user_id = uuid4()
+    before = compute_etag([(user_id, datetime(2024, 4, 21, tzinfo=timezone.utc))])
+    after = compute_etag([(user_id, datetime(2024, 4, 22, tzinfo=timezone.utc))])
+    assert before != after
+    assert before.startswith('W/"') and before.endswith('"')
+
+def test_compute_etag_changes_with_extra():
+    versions = [(uuid4(), datetime(2024, 4, 21, tzinfo=timezone.utc))]
+    assert compute_etag(versions) != compute_etag(versions, "next-cursor")
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"other", "abc"', True),
+    ("*", True),
+    ('"other"', False),
+])
+@pytest.mark.parametrize("etag", ['"abc"', 'W/"abc"'])
+def test_etag_matches(header, expected, etag):
+    assert etag_matches(make_request(header), etag) is expected
@@ -6,6 +6,7 @@ from uuid import uuid4
 import pytest
 from fastapi import Request
 
+from app.utils import link_generation
 from app.utils.link_generation import create_link, create_pagination_link, create_user_links, generate_pagination_links
 
 from urllib.parse import urlparse, parse_qs, urlunparse, urlencode
@@ -22,9 +23,17 @@ def normalize_url(url):
     return normalized_url.rstrip('/')
 
 
+@pytest.fixture(autouse=True)
+def clear_user_link_templates():
+    """Reset the module-level link template cache so tests don't share resolved routes."""
+    link_generation._user_link_templates.clear()
+    yield
+    link_generation._user_link_templates.clear()
+
 @pytest.fixture
 def mock_request():
     request = MagicMock(spec=Request)
+    request.base_url = "http://testserver/"
     request.url_for = MagicMock(side_effect=lambda action, user_id: f"http://testserver/{action}/{user_id}")
     request.url = "http://testserver/users"
     return request
@@ -49,3 +58,10 @@ def test_generate_pagination_links(mock_request):
     assert len(links) >= 4
     expected_self_url = "http://testserver/users?limit=5&skip=10"
     assert normalize_url(str(links[0].href)) == normalize_url(expected_self_url), "Self link should match expected URL"
+
+def test_create_user_links_resolves_routes_once(mock_request):
+    first, second = uuid4(), uuid4()
+    create_user_links(first, mock_request)
+    links = create_user_links(second, mock_request)
+    assert mock_request.url_for.call_count == 3
+    assert normalize_url(str(links[0].href)) == f"http://testserver/get_user/{second}"
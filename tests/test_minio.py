@@ -1,7 +1,11 @@
+import asyncio
 import io
+from urllib.parse import quote
 import pytest
 from unittest.mock import patch
-from app.utils.minio_client import upload_profile_picture, get_profile_picture_url
+from app.utils.minio_client import (
+    get_cached_profile_picture_url, get_profile_picture_url, presigned_url_cache, upload_profile_picture
+)
 
 
 @pytest.fixture
@@ -28,7 +32,7 @@ def test_upload_profile_picture_invalid_file_type(mock_minio_client):
     file_name = "profile-picture.txt"  # Invalid file type
 
     with pytest.raises(ValueError, match="Unsupported file type"):
-        upload_profile_picture(file_data, file_name)
+        upload_profile_picture(file_data, file_name, "text/plain")
 
 def test_upload_profile_picture_success(mock_minio_client, mock_settings):
     file_data = io.BytesIO(b"mock file content")
@@ -36,12 +40,12 @@ def test_upload_profile_picture_success(mock_minio_client, mock_settings):
     bucket_name = mock_settings["MINIO_BUCKET_NAME"]
 
     mock_minio_client.put_object.return_value = None
-    result_url = upload_profile_picture(file_data, file_name)
+    result_url = upload_profile_picture(file_data, file_name, "image/jpeg")
 
     mock_minio_client.put_object.assert_called_once_with(
-        bucket_name, file_name, file_data, length=-1, part_size=10 * 1024 * 1024
+        bucket_name, file_name, file_data, length=-1, part_size=10 * 1024 * 1024, content_type="image/jpeg"
     )
-    expected_url = f"{mock_settings['MINIO_ENDPOINT']}/{bucket_name}/{file_name}"
+    expected_url = f"http://{mock_settings['MINIO_ENDPOINT']}/{bucket_name}/{quote(file_name, safe='')}"
     assert result_url == expected_url
 
 def test_get_profile_picture_url_success(mock_minio_client, mock_settings):
@@ -71,12 +75,12 @@ def test_upload_profile_picture_large_file(mock_minio_client, mock_settings):
     bucket_name = mock_settings["MINIO_BUCKET_NAME"]
 
     mock_minio_client.put_object.return_value = None
-    result_url = upload_profile_picture(file_data, file_name)
+    result_url = upload_profile_picture(file_data, file_name, "image/jpeg")
 
     mock_minio_client.put_object.assert_called_once_with(
-        bucket_name, file_name, file_data, length=-1, part_size=10 * 1024 * 1024
+        bucket_name, file_name, file_data, length=-1, part_size=10 * 1024 * 1024, content_type="image/jpeg"
     )
-    expected_url = f"{mock_settings['MINIO_ENDPOINT']}/{bucket_name}/{file_name}"
+    expected_url = f"http://{mock_settings['MINIO_ENDPOINT']}/{bucket_name}/{quote(file_name, safe='')}"
     assert result_url == expected_url
 
 
@@ -94,12 +98,12 @@ def test_upload_profile_picture_special_characters(mock_minio_client, mock_setti
     bucket_name = mock_settings["MINIO_BUCKET_NAME"]
 
     mock_minio_client.put_object.return_value = None
-    result_url = upload_profile_picture(file_data, file_name)
+    result_url = upload_profile_picture(file_data, file_name, "image/jpeg")
 
     mock_minio_client.put_object.assert_called_once_with(
-        bucket_name, file_name, file_data, length=-1, part_size=10 * 1024 * 1024
+        bucket_name, file_name, file_data, length=-1, part_size=10 * 1024 * 1024, content_type="image/jpeg"
     )
-    expected_url = f"{mock_settings['MINIO_ENDPOINT']}/{bucket_name}/{file_name}"
+    expected_url = f"http://{mock_settings['MINIO_ENDPOINT']}/{bucket_name}/{quote(file_name, safe='')}"
     assert result_url == expected_url
         
 def test_upload_profile_picture_server_error(mock_minio_client):
@@ -108,7 +112,7 @@ def test_upload_profile_picture_server_error(mock_minio_client):
     mock_minio_client.put_object.side_effect = Exception("Server error")
 
     with pytest.raises(Exception, match="Server error"):
-        upload_profile_picture(file_data, file_name)
+        upload_profile_picture(file_data, file_name, "image/jpeg")
 
 
 def test_get_profile_picture_url_timeout(mock_minio_client):
@@ -124,10 +128,46 @@ def test_upload_profile_picture_empty_file(mock_minio_client, mock_settings):
     bucket_name = mock_settings["MINIO_BUCKET_NAME"]
 
     mock_minio_client.put_object.return_value = None
-    result_url = upload_profile_picture(file_data, file_name)
+    result_url = upload_profile_picture(file_data, file_name, "image/jpeg")
 
     mock_minio_client.put_object.assert_called_once_with(
-        bucket_name, file_name, file_data, length=-1, part_size=10 * 1024 * 1024
+        bucket_name, file_name, file_data, length=-1, part_size=10 * 1024 * 1024, content_type="image/jpeg"
     )
-    expected_url = f"{mock_settings['MINIO_ENDPOINT']}/{bucket_name}/{file_name}"
-    assert result_url == expected_url
\ No newline at end of file
+    expected_url = f"http://{mock_settings['MINIO_ENDPOINT']}/{bucket_name}/{quote(file_name, safe='')}"
+    assert result_url == expected_url
+
+def test_upload_profile_picture_checks_bucket_once(mock_minio_client, mock_settings):
+    with patch("app.utils.minio_client._bucket_ready", False):
+        mock_minio_client.bucket_exists.return_value = False
+        upload_profile_picture(io.BytesIO(b"first"), "first.jpg", "image/jpeg")
+        upload_profile_picture(io.BytesIO(b"second"), "second.jpg", "image/jpeg")
+
+    mock_minio_client.bucket_exists.assert_called_once_with(mock_settings["MINIO_BUCKET_NAME"])
+    mock_minio_client.make_bucket.assert_called_once_with(mock_settings["MINIO_BUCKET_NAME"])
+
+
+def test_presigned_url_cache_hit_and_expiry():
+    presigned_url_cache.clear()
+    with patch("app.utils.ttl_cache.time.monotonic", return_value=1000):
+        presigned_url_cache.set("profile-picture.jpg", "http://signed")
+    with patch("app.utils.ttl_cache.time.monotonic", return_value=3999):
+        assert presigned_url_cache.get("profile-picture.jpg") == "http://signed"
+    with patch("app.utils.ttl_cache.time.monotonic", return_value=4000):
+        assert presigned_url_cache.get("profile-picture.jpg") is None
+
+
+def test_upload_profile_picture_url_is_quoted(mock_minio_client):
+    result_url = upload_profile_picture(io.BytesIO(b"mock file content"), "profile@picture#$.jpg", "image/jpeg")
+    assert result_url == "http://localhost:9000/demo/profile%40picture%23%24.jpg"
+
+
+async def test_get_cached_profile_picture_url_coalesces_concurrent_misses(mock_minio_client):
+    presigned_url_cache.clear()
+    mock_minio_client.get_presigned_url.return_value = "http://signed"
+
+    urls = await asyncio.gather(*(get_cached_profile_picture_url("hot-avatar.jpg") for _ in range(5)))
+
+    assert urls == ["http://signed"] * 5
+    mock_minio_client.get_presigned_url.assert_called_once()
+    assert await get_cached_profile_picture_url("hot-avatar.jpg") == "http://signed"
+    mock_minio_client.get_presigned_url.assert_called_once()
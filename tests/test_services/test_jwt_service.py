@@ -0,0 +1,28 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import jwt
+
+from app.services.jwt_service import create_access_token, decode_token, invalidate_token
+
+
+def test_decode_token_caches_verified_payload():
+    token = create_access_token(data={"sub": "cached@example.com", "role": "admin"}, expires_delta=timedelta(minutes=5))
+    with patch("app.services.jwt_service.jwt.decode", wraps=jwt.decode) as mock_decode:
+        first = decode_token(token)
+        second = decode_token(token)
+    assert first == second
+    assert first["role"] == "ADMIN"
+    mock_decode.assert_called_once()
+
+def test_invalidate_token_forces_reverification():
+    token = create_access_token(data={"sub": "logout@example.com"}, expires_delta=timedelta(minutes=5))
+    decode_token(token)
+    invalidate_token(token)
+    with patch("app.services.jwt_service.jwt.decode", wraps=jwt.decode) as mock_decode:
+        assert decode_token(token)["sub"] == "logout@example.com"
+    mock_decode.assert_called_once()
+
+def test_decode_token_rejects_expired_token():
+    token = create_access_token(data={"sub": "expired@example.com"}, expires_delta=timedelta(minutes=-1))
+    assert decode_token(token) is None
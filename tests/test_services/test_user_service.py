@@ -5,6 +5,7 @@ from app.dependencies import get_settings
 from app.models.user_model import User, UserRole
 from app.services.user_service import UserService
 from app.utils.nickname_gen import generate_nickname
+from app.utils.cursor import decode_cursor
 
 pytestmark = pytest.mark.asyncio
 
@@ -86,11 +87,35 @@ async def test_delete_user_does_not_exist(db_session):
 
 # Test listing users with pagination
 async def test_list_users_with_pagination(db_session, users_with_same_role_50_users):
-    users_page_1 = await UserService.list_users(db_session, skip=0, limit=10)
-    users_page_2 = await UserService.list_users(db_session, skip=10, limit=10)
+    users_page_1, next_cursor = await UserService.list_users(db_session, limit=10)
+    users_page_2, _ = await UserService.list_users(db_session, limit=10, cursor=decode_cursor(next_cursor))
     assert len(users_page_1) == 10
     assert len(users_page_2) == 10
-    assert users_page_1[0].id != users_page_2[0].id
+    assert not {user.id for user in users_page_1} & {user.id for user in users_page_2}
+
+# Test walking every cursor returns each user exactly once, in (created_at, id) order
+async def test_list_users_cursor_walk_returns_all_users_in_order(db_session, users_with_same_role_50_users):
+    seen = []
+    cursor = None
+    while True:
+        users, next_cursor = await UserService.list_users(db_session, limit=10, cursor=cursor)
+        seen.extend((user.created_at, user.id) for user in users)
+        if next_cursor is None:
+            break
+        cursor = decode_cursor(next_cursor)
+
+    # The fixture commits every user in one transaction, so they share created_at and the id breaks ties
+    result = await db_session.execute(select(User.created_at, User.id))
+    expected = sorted(tuple(row) for row in result.all())
+    assert len(seen) == 50
+    assert len({user_id for _, user_id in seen}) == 50
+    assert seen == expected
+
+# Test the last page does not return a next cursor
+async def test_list_users_last_page_has_no_cursor(db_session, users_with_same_role_50_users):
+    users, next_cursor = await UserService.list_users(db_session, limit=50)
+    assert len(users) == 50
+    assert next_cursor is None
 
 # Test registering a user with valid data
 async def test_register_user_with_valid_data(db_session, email_service):
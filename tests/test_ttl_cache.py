@@ -0,0 +1,29 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app.utils.ttl_cache import TTLCache
+
+
+def test_ttl_cache_evicts_oldest_entry():
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_evicts_safely_under_concurrent_access():
+    cache = TTLCache(ttl=60, maxsize=16)
+
+    def churn(worker):
+        for i in range(2000):
+            key = (worker, i)
+            cache.set(key, i)
+            cache.get(key)
+            cache.pop((worker, i - 1))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(churn, range(8)))
+
+    assert len(cache._entries) <= cache.maxsize